@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from tp1.config.simulation import SimulationConfig
+
+
+@dataclass(frozen=True)
+class Route:
+    """Route taken by a plane leaving a hub once unloaded."""
+
+    destination: int  # Id of the destination hub
+    probability: float  # Probability for an unloaded plane to take this route
+    min_transit_time: float  # Shortest possible transit time (minutes)
+    mean_extra_transit_time: float = 0.0  # Mean of the exponential delay added to the shortest transit time (minutes)
+
+
+@dataclass(frozen=True)
+class HubConfig:
+    """Configuration of a single hub of the network."""
+
+    num_robots: int
+    routes: Tuple[Route, ...] = ()  # Planes not taking any route leave the network
+    mean_arrival_time: float = SimulationConfig.MEAN_ARRIVAL_TIME  # Mean time between two arrivals from outside the network
+
+
+@dataclass
+class NetworkConfig:
+    """Configuration of a network of hubs exchanging planes."""
+
+    hubs: Dict[int, HubConfig]
+    seed: int = SimulationConfig.RANDOM_SEED
+
+    def __post_init__(self):
+        for hub_id, hub in self.hubs.items():
+            if hub.num_robots not in SimulationConfig.ROBOT_SCENARIOS:
+                raise ValueError(f"Hub {hub_id}: no scenario for {hub.num_robots} robots")
+            if sum(route.probability for route in hub.routes) > 1:
+                raise ValueError(f"Hub {hub_id}: route probabilities sum above 1")
+            for route in hub.routes:
+                if route.destination not in self.hubs:
+                    raise ValueError(f"Hub {hub_id}: unknown destination hub {route.destination}")
+                if route.min_transit_time <= 0:
+                    raise ValueError(f"Hub {hub_id}: transit times must be strictly positive")
+
+    @property
+    def lookahead(self) -> float:
+        """Get the shortest transit time between two hubs, i.e. how far a hub can run ahead of the others."""
+        return min((route.min_transit_time for hub in self.hubs.values() for route in hub.routes), default=float("inf"))
+
+    @classmethod
+    def ring(
+        cls,
+        num_hubs: int,
+        num_robots: int = 8,
+        transfer_probability: float = 0.5,
+        min_transit_time: float = 30.0,
+        mean_extra_transit_time: float = 30.0,
+    ) -> "NetworkConfig":
+        """Build a ring of hubs where unloaded planes fly to one of the two neighbouring hubs (or leave the network)."""
+        hubs = {}
+        for hub_id in range(num_hubs):
+            neighbours = {(hub_id - 1) % num_hubs, (hub_id + 1) % num_hubs} - {hub_id}
+            routes = tuple(
+                Route(neighbour, transfer_probability / len(neighbours), min_transit_time, mean_extra_transit_time)
+                for neighbour in sorted(neighbours)
+            )
+            hubs[hub_id] = HubConfig(num_robots=num_robots, routes=routes)
+        return cls(hubs=hubs)
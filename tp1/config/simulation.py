@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Dict, ClassVar
-from src.random.distributions import ExponentialDistribution
+from tp1.src.random.distributions import ExponentialDistribution
 
 
 class SimulationConfig:
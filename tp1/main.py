@@ -3,10 +3,15 @@ from tp1.src.models.airplane import AirPlane
 from tp1.config.simulation import SimulationConfig
 from tp1.src.visualization.plots import SimulationPlots
 from tp1.config.logger import setup_logger
+from tp1.src.simulation.profiling import SimulationProfiler
+from tp1.src.simulation.batch import BatchSimulator
 import time
 
 SIMULATION_DURATION = 40000
 WINDOW_SIZE = 60
+PROFILE_SIMULATION = False  # Log per-event-type dispatch counters and timings (JSON) for each scenario
+BATCH_REPLICATIONS = 0  # Log 95% confidence intervals over that many batched replications for each scenario (0 to skip)
+ESTIMATE_SENSITIVITIES = False  # Log the IPA derivatives of waiting time and utilization w.r.t. the arrival and service means
 
 
 def main():
@@ -21,6 +26,10 @@ def main():
         start_time = time.time()  # only for analytics
 
         airport = Airport(num_robots=num_robots)
+        if PROFILE_SIMULATION:
+            profiler = airport.simulator.enable_profiling(SimulationProfiler())
+        if ESTIMATE_SENSITIVITIES:
+            perturbation = airport.enable_perturbation_analysis()
         airport.run_simulation(SIMULATION_DURATION)
 
         current_time = airport.simulator.get_current_time()
@@ -36,6 +45,19 @@ def main():
         root_logger.info(f"Average queue waiting time: {queue_waiting_time:.1f} minutes")
         root_logger.info(f"Robot utilization: {airport.get_robot_utilization(current_time):.2%}")
         root_logger.info(f"Scenario execution time: {time.time() - start_time:.2f} seconds")
+        if PROFILE_SIMULATION:
+            root_logger.info(f"Simulator profile: {profiler.to_json()}")
+
+        if ESTIMATE_SENSITIVITIES:
+            for metric, estimates in perturbation.get_sensitivities(current_time).items():
+                for key, (mean, half_width) in estimates.items():
+                    label = metric if key == "value" else f"d {metric} / d {key}"
+                    root_logger.info(f"IPA 95% CI - {label}: {mean:.4f} ± {half_width:.4f}")
+
+        if BATCH_REPLICATIONS > 0:
+            results = BatchSimulator(num_robots, num_replications=BATCH_REPLICATIONS).run(SIMULATION_DURATION)
+            for name, (mean, half_width) in results.confidence_intervals(level=0.95).items():
+                root_logger.info(f"95% CI over {BATCH_REPLICATIONS} replications - {name}: {mean:.3f} ± {half_width:.3f}")
 
         scenarios[num_robots] = airport.planes
 
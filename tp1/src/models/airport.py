@@ -1,10 +1,17 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from tp1.src.random.distributions import ExponentialDistribution
+from tp1.src.random.sources import DurationSource
 from tp1.src.models.airplane import AirPlane, PlaneStatus
 from tp1.config.simulation import SimulationConfig
 from tp1.config.logger import setup_logger
-from tp1.src.simulation.events import Event, EventType
+from tp1.src.simulation.events import Event, EventType, events_from_times
 from tp1.src.simulation.simulator import Simulator
+from tp1.src.simulation.perturbation import PerturbationAnalysis
+from itertools import chain
+import dataclasses
+import random
+import copy
+import math
 
 logger = setup_logger("airport")
 
@@ -12,7 +19,17 @@ logger = setup_logger("airport")
 class Airport:
     """Represents the airport system with its planes, robots, and queue."""
 
-    def __init__(self, num_robots: int):
+    def __init__(
+        self,
+        num_robots: int,
+        inter_arrival_time: Optional[DurationSource] = None,
+        processing_time: Optional[DurationSource] = None,
+    ):
+        """
+        - num_robots (int): Scenario to simulate (see SimulationConfig.ROBOT_SCENARIOS)
+        - inter_arrival_time (DurationSource): Source of inter-arrival times (e.g. a replayed trace), exponential by default
+        - processing_time (DurationSource): Source of service times (e.g. a replayed trace), exponential by default
+        """
         self.config = SimulationConfig(num_robots)
 
         self.planes: List[AirPlane] = []  # planes in the system
@@ -20,8 +37,14 @@ class Airport:
         self.current_plane: Optional[AirPlane] = None  # plane being served
 
         # We use a fixed seed for the random number generator to ensure reproducibility
-        self.inter_arrival_time = ExponentialDistribution(mean=self.config.MEAN_ARRIVAL_TIME, seed=self.config.RANDOM_SEED)
-        self.processing_time = ExponentialDistribution(mean=self.config.ROBOT_SCENARIOS[num_robots], seed=self.config.RANDOM_SEED)
+        self.inter_arrival_time = inter_arrival_time or ExponentialDistribution(
+            mean=self.config.MEAN_ARRIVAL_TIME, seed=self.config.RANDOM_SEED
+        )
+        self.processing_time = processing_time or ExponentialDistribution(
+            mean=self.config.ROBOT_SCENARIOS[num_robots], seed=self.config.RANDOM_SEED
+        )
+
+        self.perturbation: Optional[PerturbationAnalysis] = None  # IPA derivatives, tracked only when enabled
 
         self.simulator = Simulator()
         self.simulator.register_handler(EventType.PLANE_ARRIVAL, self.handle_plane_arrival)
@@ -32,7 +55,8 @@ class Airport:
         current_time = event.time
 
         plane = self.add_plane(current_time)
-        self.schedule_next_arrival(current_time)
+        if self.perturbation is not None:
+            self.perturbation.record_arrival(plane)
         logger.debug(f"Time {current_time:.1f}: Plane {plane.id:04d} arrived\t[queue: {self.get_queue_length()}]")
 
         if self.can_start_service():
@@ -45,6 +69,61 @@ class Airport:
         logger.debug(f"Time {current_time:.1f}: Plane {event.data.id:04d} finished\t[queue: {self.get_queue_length()}]")
         self.finish_serving_plane(current_time)
 
+    def enable_perturbation_analysis(self) -> PerturbationAnalysis:
+        """
+        Track the derivatives of the waiting time and utilization with respect to the arrival and service means.
+        Only the planes arriving from now on are analysed, so it can be enabled after a warm-up.
+        """
+        if not (hasattr(self.inter_arrival_time, "mean") and hasattr(self.processing_time, "mean")):
+            raise ValueError("Perturbation analysis needs scale-family (e.g. exponential) arrival and service times")
+        self.perturbation = PerturbationAnalysis(
+            arrival_mean=self.inter_arrival_time.mean,
+            service_mean=self.processing_time.mean,
+            first_plane_id=len(self.planes),
+            start_time=self.planes[-1].queue_entry_time if self.planes else 0.0,
+        )
+        return self.perturbation
+
+    def fork(self, seed: Optional[int] = None) -> "Airport":
+        """
+        Copy the current state of the airport: planes, queue, pending events and random number generator state.
+        Without a seed, the copy draws the very same random numbers as the original (and so follows the same path);
+        with a seed, it draws from a new independent generator.
+        Unloaded planes never change anymore, so they are shared with the copy.
+        """
+        forked_rngs = {}
+
+        def fork_source(source: DurationSource) -> DurationSource:
+            original_rng = getattr(source, "rng", None)
+            if id(original_rng) not in forked_rngs:
+                rng = random.Random(seed)
+                if seed is None and original_rng is not None:
+                    rng.setstate(original_rng.getstate())
+                forked_rngs[id(original_rng)] = rng
+            return source.fork(forked_rngs[id(original_rng)])
+
+        clone = copy.copy(self)
+        clone.inter_arrival_time = fork_source(self.inter_arrival_time)
+        clone.processing_time = fork_source(self.processing_time)
+        clone.perturbation = copy.deepcopy(self.perturbation)
+
+        forked_planes = {id(plane): dataclasses.replace(plane) for plane in self.queue}
+        if self.current_plane is not None:
+            forked_planes[id(self.current_plane)] = dataclasses.replace(self.current_plane)
+        clone.planes = [forked_planes.get(id(plane), plane) for plane in self.planes]
+        clone.queue = [forked_planes[id(plane)] for plane in self.queue]
+        clone.current_plane = forked_planes.get(id(self.current_plane))
+
+        clone.simulator = self.simulator.fork(
+            map_data=lambda data: forked_planes.get(id(data), data),
+            fork_stream=lambda head: chain(
+                [head], events_from_times(clone.generate_arrival_times(head.time), EventType.PLANE_ARRIVAL)
+            ),
+        )
+        clone.simulator.register_handler(EventType.PLANE_ARRIVAL, clone.handle_plane_arrival)
+        clone.simulator.register_handler(EventType.END_LOADING, clone.handle_end_loading)
+        return clone
+
     def add_plane(self, arrival_time: float) -> AirPlane:
         """Add a new plane to the system."""
         plane = AirPlane(id=len(self.planes), queue_entry_time=arrival_time)
@@ -52,24 +131,33 @@ class Airport:
         self.queue.append(plane)
         return plane
 
-    def schedule_next_arrival(self, current_time: float) -> None:
-        """Schedule the next plane arrival."""
-        next_arrival_time = current_time + self.inter_arrival_time.generate()
-        self.simulator.schedule(Event(time=next_arrival_time, type=EventType.PLANE_ARRIVAL))
+    def generate_arrival_times(self, start_time: float = 0.0) -> Iterator[float]:
+        """Generate the successive plane arrival times, lazily drawing each inter-arrival time."""
+        arrival_time = start_time + self.inter_arrival_time.generate()
+        # An infinite time means the arrival source is exhausted (end of a replayed trace)
+        while not math.isinf(arrival_time):
+            yield arrival_time
+            arrival_time += self.inter_arrival_time.generate()
 
     def start_serving_plane(self, current_time: float) -> None:
         """Start serving the next plane in queue."""
         if not self.can_start_service():
             return
 
+        service_time = self.processing_time.generate()
+        # Unlike arrivals, the simulation cannot go on without service times: the plane would never leave the robots
+        if math.isinf(service_time):
+            raise ValueError(f"Processing time source exhausted at time {current_time:.1f} (end of the replayed trace)")
+
         self.current_plane = self.queue.pop(0)
         self.current_plane.status = PlaneStatus.BEING_SERVED
         self.current_plane.service_start_time = current_time
 
-        service_time = self.processing_time.generate()
         service_end_time = current_time + service_time
 
         self.simulator.schedule(Event(time=service_end_time, type=EventType.END_LOADING, data=self.current_plane))
+        if self.perturbation is not None:
+            self.perturbation.record_service_start(self.current_plane, service_time)
         logger.debug(f"Time {current_time:.1f}: Plane {self.current_plane.id:04d} served \t[delay: {service_time: .1f}m]")
 
     def finish_serving_plane(self, current_time: float) -> None:
@@ -84,9 +172,14 @@ class Airport:
         if self.can_start_service():
             self.start_serving_plane(current_time)
 
+    def schedule_arrivals(self) -> None:
+        """Start the stream of plane arrivals."""
+        # Arrivals do not depend on the system state, so they are merged in as a stream rather than going through the heap
+        self.simulator.add_stream(events_from_times(self.generate_arrival_times(), EventType.PLANE_ARRIVAL))
+
     def run_simulation(self, simulation_time: float) -> None:
         """Run the simulation for the specified duration."""
-        self.schedule_next_arrival(0.0)
+        self.schedule_arrivals()
         self.simulator.run(simulation_time)
 
     def get_queue_length(self) -> int:
@@ -115,6 +208,10 @@ class Airport:
         hours = current_time / 60.0
         return unloaded_planes / hours if hours > 0 else 0.0
 
+    def is_empty(self) -> bool:
+        """Check if there is no plane being served nor waiting."""
+        return self.current_plane is None and self.get_queue_length() == 0
+
     def can_start_service(self) -> bool:
         """Check if we can start serving a new plane."""
         return self.current_plane is None and self.get_queue_length() > 0
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from tp1.config.network import HubConfig, Route
+from tp1.config.simulation import SimulationConfig
+from tp1.src.models.airport import Airport
+from tp1.src.models.airplane import AirPlane
+from tp1.src.random.distributions import ExponentialDistribution
+from tp1.src.simulation.events import Event, EventType
+import random
+
+
+@dataclass(frozen=True)
+class TransitMessage:
+    """A plane flying from one hub to another, delivered to the destination as a plane arrival."""
+
+    arrival_time: float
+    origin: int
+    destination: int
+    plane_id: int  # Id of the plane at its origin hub
+
+
+class HubAirport(Airport):
+    """Airport of a network: unloaded planes may depart to other hubs after a transit delay."""
+
+    def __init__(self, hub_id: int, config: HubConfig, seed: int):
+        # Each hub draws from its own generator so that its sample path does not depend on which hubs share its process
+        self.rng = random.Random(f"{seed}:{hub_id}")
+        super().__init__(
+            num_robots=config.num_robots,
+            inter_arrival_time=ExponentialDistribution(mean=config.mean_arrival_time, rng=self.rng),
+            processing_time=ExponentialDistribution(mean=SimulationConfig.ROBOT_SCENARIOS[config.num_robots], rng=self.rng),
+        )
+        self.hub_id = hub_id
+        self.routes = config.routes
+        self.extra_transit_times = {
+            route.destination: ExponentialDistribution(mean=route.mean_extra_transit_time, rng=self.rng)
+            for route in self.routes
+            if route.mean_extra_transit_time > 0
+        }
+
+        self.transit_arrivals = 0
+        self.departures = 0
+        self.outbox: List[TransitMessage] = []  # departures not yet delivered to their destination
+
+    def fork(self, seed: Optional[int] = None) -> "HubAirport":
+        """Copy the current state of the hub (see Airport.fork), with its own generator, transit times and outbox."""
+        clone = super().fork(seed)
+        # The arrival and processing times draw from the hub generator, so their (forked) generator replaces it
+        clone.rng = clone.inter_arrival_time.rng
+        clone.extra_transit_times = {
+            destination: source.fork(clone.rng) for destination, source in self.extra_transit_times.items()
+        }
+        clone.outbox = list(self.outbox)
+        return clone
+
+    def handle_plane_arrival(self, event: Event) -> None:
+        """Handle a plane arrival event (from outside the network or from another hub)."""
+        if isinstance(event.data, TransitMessage):
+            self.transit_arrivals += 1
+        super().handle_plane_arrival(event)
+
+    def handle_end_loading(self, event: Event) -> None:
+        """Handle an end of loading event, then send the plane on its way."""
+        super().handle_end_loading(event)
+        self.depart(event.data, event.time)
+
+    def choose_route(self) -> Optional[Route]:
+        """Draw the route of an unloaded plane (None if it leaves the network)."""
+        u = self.rng.random()
+        for route in self.routes:
+            if u < route.probability:
+                return route
+            u -= route.probability
+        return None
+
+    def depart(self, plane: AirPlane, current_time: float) -> None:
+        """Send an unloaded plane to its next hub, if any."""
+        route = self.choose_route()
+        if route is None:
+            return
+
+        transit_time = route.min_transit_time
+        if route.destination in self.extra_transit_times:
+            transit_time += self.extra_transit_times[route.destination].generate()
+
+        self.departures += 1
+        self.outbox.append(TransitMessage(current_time + transit_time, self.hub_id, route.destination, plane.id))
+
+    def receive(self, message: TransitMessage) -> None:
+        """Schedule the arrival of a plane coming from another hub."""
+        self.simulator.schedule(Event(time=message.arrival_time, type=EventType.PLANE_ARRIVAL, data=message))
+
+    def collect_departures(self) -> List[TransitMessage]:
+        """Get (and forget) the departures since the last call."""
+        outbox, self.outbox = self.outbox, []
+        return outbox
+
+    def get_statistics(self, current_time: float) -> dict:
+        """Get the performance indicators of the hub at a given time."""
+        return {
+            "total_planes": len(self.planes),
+            "transit_arrivals": self.transit_arrivals,
+            "departures": self.departures,
+            "planes_unloaded": AirPlane.count_unloaded_by_time(self.planes, current_time),
+            "queue_length": self.get_queue_length(),
+            "mean_waiting_time": AirPlane.calculate_mean_waiting_time(self.planes, current_time),
+            "robot_utilization": AirPlane.calculate_mean_robot_utilization(self.planes, current_time),
+        }
@@ -1,27 +1,40 @@
+from tp1.src.random.sources import DurationSource
 import random
 import math
+import copy
 
 
-class RandomDistributions:
+class RandomDistributions(DurationSource):
     """Class for generating random numbers from various distributions."""
 
-    def __init__(self, seed: int = None):
-        if seed is not None:
+    def __init__(self, seed: int = None, rng: random.Random = None):
+        """
+        - seed (int): Seed of the module-level random number generator (ignored when rng is given)
+        - rng (random.Random): Independent random number generator to draw from instead of the module-level one
+        """
+        self.rng = rng or random
+        if seed is not None and rng is None:
             random.seed(seed)
 
+    def fork(self, rng: random.Random) -> "RandomDistributions":
+        """Copy the distribution, drawing from the given random number generator from now on."""
+        clone = copy.copy(self)
+        clone.rng = rng
+        return clone
+
 
 # DOC: https://fr.wikipedia.org/wiki/Loi_exponentielle
 class ExponentialDistribution(RandomDistributions):
     """Class for generating random numbers from an exponential distribution."""
 
-    def __init__(self, mean: float, seed: int = None):
-        super().__init__(seed)
+    def __init__(self, mean: float, seed: int = None, rng: random.Random = None):
+        super().__init__(seed, rng)
         self.mean = mean
         self.lambda_ = 1 / self.mean  # Rate parameter (λ)
 
     def generate(self) -> float:
         """Generate a random number from an exponential distribution."""
-        u = random.random()  # Uniform random number in [0,1)
+        u = self.rng.random()  # Uniform random number in [0,1)
         return -(1 / self.lambda_) * math.log(1 - u)
 
 
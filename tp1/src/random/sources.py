@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class DurationSource(ABC):
+    """Base class for anything producing successive durations (inter-arrival times, service times, ...)."""
+
+    @abstractmethod
+    def generate(self) -> float:
+        """Get the next duration (math.inf once the source is exhausted)."""
+
+    def fork(self, rng) -> "DurationSource":
+        """Copy the source, drawing from the given random number generator from now on."""
+        raise ValueError(f"{type(self).__name__} cannot be forked")
@@ -0,0 +1,130 @@
+from abc import abstractmethod
+from typing import Iterator, List, Optional
+from tp1.src.random.sources import DurationSource
+import numpy as np
+import pandas as pd
+import math
+
+
+class TraceSource(DurationSource):
+    """
+    Replays durations recorded in a schedule file, one chunk at a time, so that the full trace is never held in memory.
+    The trace holds either durations directly or absolute timestamps (e.g. arrival logs), which are then replayed as
+    the delays between two consecutive timestamps.
+    """
+
+    def __init__(self, timestamps: bool = False, origin: float = 0.0):
+        """
+        - timestamps (bool): Whether the trace holds absolute timestamps instead of durations
+        - origin (float): Timestamp corresponding to the simulation time 0.0 (only used with timestamps)
+        """
+        self.timestamps = timestamps
+        self._last_timestamp = origin
+
+        self._chunks = self._read_chunks()
+        self._chunk: List[float] = []
+        self._position = 0
+        self._exhausted = False
+
+    @abstractmethod
+    def _read_chunks(self) -> Iterator[np.ndarray]:
+        """Yield successive chunks of the trace."""
+
+    def _next_value(self) -> Optional[float]:
+        """Get the next raw value from the trace (None once exhausted)."""
+        while self._position >= len(self._chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return None
+            # Plain Python floats are much faster to hand out one by one than numpy scalars
+            self._chunk = chunk.tolist()
+            self._position = 0
+
+        value = self._chunk[self._position]
+        self._position += 1
+        return value
+
+    def generate(self) -> float:
+        """Get the next duration of the trace (math.inf once the trace is exhausted)."""
+        if self._exhausted:
+            return math.inf
+
+        value = self._next_value()
+        if value is None:
+            self._exhausted = True
+            return math.inf
+
+        if not self.timestamps:
+            return value
+
+        duration = value - self._last_timestamp
+        if duration < 0:
+            raise ValueError(f"Trace timestamps must be sorted ({value} follows {self._last_timestamp})")
+        self._last_timestamp = value
+        return duration
+
+
+class MemmapTraceSource(TraceSource):
+    """Replays a trace stored as a flat binary array (e.g. written with numpy.ndarray.tofile) through numpy.memmap."""
+
+    def __init__(
+        self,
+        path: str,
+        dtype: str = "<f8",
+        num_columns: int = 1,
+        column: int = 0,
+        chunk_size: int = 65536,
+        timestamps: bool = False,
+        origin: float = 0.0,
+    ):
+        """
+        - path (str): Path of the binary schedule file
+        - dtype (str): Numpy dtype of the stored values
+        - num_columns (int): Number of values per record (e.g. 2 for arrival timestamp + service duration)
+        - column (int): Index of the column to replay
+        - chunk_size (int): Number of records copied out of the mapping at once
+        """
+        self.trace = np.memmap(path, dtype=dtype, mode="r").reshape(-1, num_columns)
+        self.column = column
+        self.chunk_size = chunk_size
+        super().__init__(timestamps=timestamps, origin=origin)
+
+    def _read_chunks(self) -> Iterator[np.ndarray]:
+        """Yield successive slices of the mapped file, letting the OS page the rest in and out."""
+        for start in range(0, len(self.trace), self.chunk_size):
+            yield np.asarray(self.trace[start : start + self.chunk_size, self.column], dtype=float)
+
+
+class CsvTraceSource(TraceSource):
+    """Replays one column of a CSV schedule, streamed in chunks."""
+
+    def __init__(self, path: str, column: str, chunk_size: int = 65536, timestamps: bool = False, origin: float = 0.0):
+        """
+        - path (str): Path of the CSV schedule file (with a header line)
+        - column (str): Name of the column to replay
+        - chunk_size (int): Number of rows parsed at once
+        """
+        self.path = path
+        self.column = column
+        self.chunk_size = chunk_size
+        super().__init__(timestamps=timestamps, origin=origin)
+
+    def _read_chunks(self) -> Iterator[np.ndarray]:
+        """Yield successive chunks of the column, parsed lazily."""
+        with pd.read_csv(self.path, usecols=[self.column], chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                yield chunk[self.column].to_numpy(dtype=float)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import os
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "arrivals.bin")
+        np.array([3.0, 10.5, 12.0, 30.2]).tofile(path)
+
+        arrivals = MemmapTraceSource(path, timestamps=True, chunk_size=2)
+        print("Temps entre arrivées d'avions (minutes):")
+        for i in range(5):
+            print(f"  Avion {i+1}: {arrivals.generate():.2f} minutes")
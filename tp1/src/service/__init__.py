@@ -0,0 +1,3 @@
+"""
+Local job service to submit simulation runs and stream their progress.
+"""
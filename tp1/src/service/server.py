@@ -0,0 +1,208 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import AsyncIterator, Dict, List, Optional, Set
+from tp1.config.logger import setup_logger
+from tp1.src.service.worker import ScenarioRequest, run_scenario, warm_up
+import multiprocessing
+import argparse
+import asyncio
+import json
+
+logger = setup_logger("service")
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+
+class SimulationJob:
+    """An in-flight run, shared by every client that submitted the same scenario."""
+
+    def __init__(self, scenario: ScenarioRequest):
+        self.scenario = scenario
+        self.updates: List[dict] = []  # Every update published so far, replayed to late subscribers
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.done = False
+
+    def publish(self, update: dict) -> None:
+        """Send an update to every subscriber."""
+        self.updates.append(update)
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(update)
+
+    def finish(self, update: dict) -> None:
+        """Send the last update of the job."""
+        self.publish(update)
+        self.done = True
+
+    async def stream(self) -> AsyncIterator[dict]:
+        """Yield the past then the upcoming updates of the job, until its end."""
+        subscriber: asyncio.Queue = asyncio.Queue()
+        for update in self.updates:
+            subscriber.put_nowait(update)
+        if not self.done:
+            self.subscribers.add(subscriber)
+
+        try:
+            while True:
+                update = await subscriber.get()
+                yield update
+                if update["event"] in ("result", "error"):
+                    return
+        finally:
+            self.subscribers.discard(subscriber)
+
+
+class SimulationService:
+    """Runs submitted scenarios on a bounded pool of warm worker processes."""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16):
+        """
+        - max_workers (int): Number of worker processes (i.e. of runs executed at the same time)
+        - max_pending (int): Number of distinct in-flight runs (running or queued) above which submissions are refused
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.jobs: Dict[str, SimulationJob] = {}  # In-flight jobs, by scenario key
+
+        self.pool = ProcessPoolExecutor(max_workers=max_workers, initializer=warm_up)
+        self.manager = multiprocessing.Manager()  # Its queues can be handed to the pool workers
+        self.relays = ThreadPoolExecutor(max_workers=max_pending)  # One thread per in-flight job, waiting on its progress
+
+    async def start(self) -> None:
+        """Spawn (and warm up) every worker ahead of the first submission."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, warm_up) for _ in range(self.max_workers)))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self.pool.shutdown(cancel_futures=True)
+        self.relays.shutdown(cancel_futures=True)
+        self.manager.shutdown()
+
+    def submit(self, scenario: ScenarioRequest) -> Optional[SimulationJob]:
+        """Get the in-flight job running this scenario, starting one if needed (None if too many are pending)."""
+        job = self.jobs.get(scenario.key)
+        if job is not None:
+            return job
+        if len(self.jobs) >= self.max_pending:
+            return None
+
+        job = self.jobs[scenario.key] = SimulationJob(scenario)
+        asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    async def _run(self, job: SimulationJob) -> None:
+        """Run a job on the pool, relaying its progress updates."""
+        loop = asyncio.get_running_loop()
+        progress_queue = self.manager.Queue()
+        job.publish({"event": "queued", "scenario": asdict(job.scenario)})
+
+        async def relay_progress() -> None:
+            while True:
+                update = await loop.run_in_executor(self.relays, progress_queue.get)
+                if update is None:
+                    return
+                job.publish({"event": "progress", **update})
+
+        relay = loop.create_task(relay_progress())
+        try:
+            result = await loop.run_in_executor(self.pool, run_scenario, job.scenario, progress_queue)
+            update = {"event": "result", **result}
+        except Exception as error:
+            logger.exception(f"Run failed for {job.scenario}")
+            update = {"event": "error", "message": str(error)}
+
+        progress_queue.put(None)
+        await relay
+        del self.jobs[job.scenario.key]
+        job.finish(update)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP request: POST /runs with a JSON scenario streams back newline-delimited JSON updates."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while (line := (await reader.readline()).decode("latin-1").strip()) != "":
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            try:
+                content_length = int(headers.get("content-length", 0))
+                if content_length < 0:
+                    raise ValueError(f"Negative Content-Length: {content_length}")
+            except ValueError as error:
+                return await self._respond(writer, 400, {"error": str(error)})
+            body = await reader.readexactly(content_length)
+
+            if len(request_line) < 2 or request_line[1] != "/runs":
+                return await self._respond(writer, 404, {"error": "Unknown path (use POST /runs)"})
+            if request_line[0] != "POST":
+                return await self._respond(writer, 405, {"error": "Only POST is allowed"})
+
+            try:
+                scenario = ScenarioRequest(**json.loads(body or b"{}"))
+            except (TypeError, ValueError) as error:
+                return await self._respond(writer, 400, {"error": str(error)})
+
+            job = self.submit(scenario)
+            if job is None:
+                return await self._respond(writer, 503, {"error": f"Too many pending runs ({self.max_pending})"})
+
+            self._write_head(writer, 200)
+            async for update in job.stream():
+                writer.write(json.dumps(update).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # The client went away: the job keeps running for the other subscribers
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write_head(writer: asyncio.StreamWriter, status: int) -> None:
+        """Write the status line and headers of a (streamed, connection-delimited) response."""
+        writer.write(
+            (
+                f"HTTP/1.0 {status} {HTTP_REASONS[status]}\r\n"
+                "Content-Type: application/x-ndjson\r\n"
+                "Connection: close\r\n"
+                "\r\n"
+            ).encode()
+        )
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: dict) -> None:
+        """Write a complete single-line response."""
+        self._write_head(writer, status)
+        writer.write(json.dumps(payload).encode() + b"\n")
+        await writer.drain()
+
+
+async def serve(host: str, port: int, unix_socket: Optional[str], max_workers: int, max_pending: int) -> None:
+    """Start the service and serve until cancelled."""
+    service = SimulationService(max_workers=max_workers, max_pending=max_pending)
+    await service.start()
+    try:
+        if unix_socket is not None:
+            server = await asyncio.start_unix_server(service.handle_connection, path=unix_socket)
+            logger.info(f"Simulation service listening on {unix_socket} ({max_workers} warm workers)")
+        else:
+            server = await asyncio.start_server(service.handle_connection, host=host, port=port)
+            logger.info(f"Simulation service listening on http://{host}:{port} ({max_workers} warm workers)")
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+
+# python -m tp1.src.service.server --port 8765
+# curl -N -X POST localhost:8765/runs -d '{"num_robots": 2, "report_interval": 5000}'
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local service running airport simulations")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=16)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.workers, args.max_pending))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,78 @@
+from dataclasses import dataclass, asdict
+from typing import Optional
+from tp1.config.simulation import SimulationConfig
+from tp1.src.models.airport import Airport
+from tp1.src.models.airplane import AirPlane
+import json
+import math
+
+
+@dataclass(frozen=True)
+class ScenarioRequest:
+    """A simulation run submitted to the service."""
+
+    num_robots: int
+    simulation_time: float = SimulationConfig.SIMULATION_TIME
+    report_interval: float = 4000.0  # Simulated minutes between two progress updates
+    window_size: int = 60  # Window (minutes) used for the unloaded planes rate
+
+    def __post_init__(self):
+        # Normalise the types so that e.g. 5 and 5.0 robots, or 40000 and "40000" minutes, share the same key
+        for name, kind in (("num_robots", int), ("simulation_time", float), ("report_interval", float), ("window_size", int)):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                raise TypeError(f"{name} must be a number, got {value!r}")
+            try:
+                number = float(value)
+            except OverflowError:
+                raise ValueError(f"{name} is too large") from None
+            if kind is int and not number.is_integer():
+                raise ValueError(f"{name} must be an integer, got {value!r}")
+            object.__setattr__(self, name, kind(number))
+
+        if self.num_robots not in SimulationConfig.ROBOT_SCENARIOS:
+            raise ValueError(f"No scenario for {self.num_robots} robots (available: {list(SimulationConfig.ROBOT_SCENARIOS)})")
+        if not all(0 < value < math.inf for value in (self.simulation_time, self.report_interval, self.window_size)):
+            raise ValueError("simulation_time, report_interval and window_size must be strictly positive and finite")
+
+    @property
+    def key(self) -> str:
+        """Get a canonical representation, identical for identical requests."""
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+def get_metrics(airport: Airport, current_time: float, window_size: int) -> dict:
+    """Get the performance indicators of an airport at a given time."""
+    return {
+        "time": current_time,
+        "total_planes": len(airport.planes),
+        "planes_unloaded": AirPlane.count_unloaded_by_time(airport.planes, current_time),
+        "mean_unloaded_per_window": AirPlane.calculate_mean_unloaded_rate(airport.planes, current_time, window_size),
+        "queue_length": airport.get_queue_length(),
+        "mean_queue_length": AirPlane.calculate_mean_queue_length(airport.planes, current_time),
+        "mean_waiting_time": AirPlane.calculate_mean_waiting_time(airport.planes, current_time),
+        "robot_utilization": AirPlane.calculate_mean_robot_utilization(airport.planes, current_time),
+    }
+
+
+def run_scenario(scenario: ScenarioRequest, progress_queue: Optional[object] = None) -> dict:
+    """
+    Run a scenario in steps of report_interval, putting interim metrics on the progress queue after each step.
+    Return the final metrics.
+    """
+    airport = Airport(num_robots=scenario.num_robots)
+    airport.schedule_arrivals()
+
+    current_time = 0.0
+    while current_time < scenario.simulation_time:
+        current_time = min(current_time + scenario.report_interval, scenario.simulation_time)
+        airport.simulator.run(current_time)
+        if progress_queue is not None and current_time < scenario.simulation_time:
+            progress_queue.put(get_metrics(airport, current_time, scenario.window_size))
+
+    return get_metrics(airport, scenario.simulation_time, scenario.window_size)
+
+
+def warm_up() -> None:
+    """Import the heavy modules once per worker process, so that runs do not pay for it."""
+    import tp1.src.visualization.plots  # noqa: F401 (pulls matplotlib)
@@ -0,0 +1,111 @@
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple
+from tp1.config.simulation import SimulationConfig
+from tp1.src.simulation.statistics import confidence_interval
+import numpy as np
+
+
+@dataclass
+class BatchResults:
+    """Per-replication metrics of a batch run, each as an array of shape (R,)."""
+
+    planes_arrived: np.ndarray
+    planes_unloaded: np.ndarray
+    planes_per_hour: np.ndarray
+    mean_waiting_time: np.ndarray
+    mean_queue_length: np.ndarray
+    robot_utilization: np.ndarray
+    final_queue_length: np.ndarray
+
+    def confidence_intervals(self, level: float = 0.95) -> Dict[str, Tuple[float, float]]:
+        """Compute a Student confidence interval (mean, half width) over the replications for each metric."""
+        return {field.name: confidence_interval(getattr(self, field.name), level) for field in fields(self)}
+
+
+class BatchSimulator:
+    """
+    Simulates R independent replications of the single-robot-team airport queue in lockstep.
+    The state of the replications is held in arrays of shape (R,) and the planes are processed one rank at a time for
+    all replications at once, using the Lindley recursion (a plane starts being served at max(arrival, previous end)).
+    Random draws are made by blocks of shape (R, block_size) so that memory stays bounded whatever the horizon.
+    """
+
+    def __init__(self, num_robots: int, num_replications: int, seed: Optional[int] = None, block_size: int = 256):
+        self.config = SimulationConfig(num_robots)
+        self.num_replications = num_replications
+        self.block_size = block_size
+        self.rng = np.random.default_rng(self.config.RANDOM_SEED if seed is None else seed)
+
+    def _draw_exponential(self, mean: float) -> np.ndarray:
+        """Draw a (R, block_size) matrix of exponential variates by inverse transform."""
+        u = self.rng.random((self.num_replications, self.block_size))  # Uniform random numbers in [0,1)
+        return -mean * np.log(1 - u)
+
+    def run(self, simulation_time: float, warmup_time: float = 0.0) -> BatchResults:
+        """
+        Run every replication until simulation_time and measure the metrics over [warmup_time, simulation_time].
+        With no warm-up, metrics match the ones of AirPlane and Airport for a single event-driven run.
+        """
+        if not 0 <= warmup_time < simulation_time:
+            raise ValueError(f"Warm-up time ({warmup_time}) must be within [0, simulation_time ({simulation_time}))")
+
+        shape = (self.num_replications,)
+        observed_time = simulation_time - warmup_time
+
+        arrival_time = np.zeros(shape)  # Arrival time of the last plane of each replication
+        robots_free_time = np.zeros(shape)  # End of service of the last plane of each replication
+
+        planes_arrived = np.zeros(shape, dtype=int)
+        planes_unloaded = np.zeros(shape, dtype=int)
+        total_waiting_time = np.zeros(shape)
+        total_queue_time = np.zeros(shape)
+        total_busy_time = np.zeros(shape)
+        final_queue_length = np.zeros(shape, dtype=int)
+
+        while np.any(arrival_time <= simulation_time):
+            arrival_times = arrival_time[:, None] + np.cumsum(self._draw_exponential(self.config.MEAN_ARRIVAL_TIME), axis=1)
+            service_times = self._draw_exponential(self.config.robot_processing_time)
+
+            for rank in range(self.block_size):
+                arrival_time = arrival_times[:, rank]
+                start_time = np.maximum(arrival_time, robots_free_time)
+                robots_free_time = start_time + service_times[:, rank]
+
+                # Planes arriving after the horizon contribute nothing below, whatever their (virtual) service
+                arrived = arrival_time <= simulation_time
+                unloaded = (robots_free_time > warmup_time) & (robots_free_time <= simulation_time)
+
+                planes_arrived += arrived & (arrival_time > warmup_time)
+                planes_unloaded += unloaded
+                total_waiting_time += np.where(unloaded, start_time - arrival_time, 0.0)
+                total_queue_time += np.clip(
+                    np.minimum(start_time, simulation_time) - np.maximum(arrival_time, warmup_time), 0.0, None
+                )
+                total_busy_time += np.clip(
+                    np.minimum(robots_free_time, simulation_time) - np.maximum(start_time, warmup_time), 0.0, None
+                )
+                final_queue_length += arrived & (start_time > simulation_time)
+
+            arrival_time = arrival_times[:, -1]
+
+        return BatchResults(
+            planes_arrived=planes_arrived,
+            planes_unloaded=planes_unloaded,
+            planes_per_hour=planes_unloaded / (observed_time / 60.0),
+            mean_waiting_time=np.divide(total_waiting_time, planes_unloaded, out=np.zeros(shape), where=planes_unloaded > 0),
+            mean_queue_length=total_queue_time / observed_time,
+            robot_utilization=total_busy_time / observed_time,
+            final_queue_length=final_queue_length,
+        )
+
+
+# python -m tp1.src.simulation.batch
+if __name__ == "__main__":
+    import time
+
+    for num_robots in SimulationConfig.ROBOT_SCENARIOS:
+        start = time.time()
+        results = BatchSimulator(num_robots, num_replications=10000).run(SimulationConfig.SIMULATION_TIME)
+        print(f"{num_robots} robots ({time.time() - start:.1f}s for 10000 replications):")
+        for name, (mean, half_width) in results.confidence_intervals().items():
+            print(f"  {name}: {mean:.3f} ± {half_width:.3f}")
@@ -1,6 +1,6 @@
 # DOC: https://www.geeksforgeeks.org/heap-queue-or-heapq-in-python/
-from dataclasses import dataclass
-from typing import Callable, Any
+from dataclasses import dataclass, replace
+from typing import Callable, Any, Iterable, Iterator
 import heapq
 from enum import Enum, auto
 
@@ -51,10 +51,33 @@ class EventQueue:
         self._time = event.time
         return event
 
+    def peek(self) -> Event:
+        """Get the next event without removing it from the queue."""
+        if not self._queue:
+            raise IndexError("No more events in the queue")
+        return self._queue[0]
+
     def has_events(self) -> bool:
         """Check if there are any events remaining."""
         return len(self._queue) > 0
 
+    def fork(self, map_data: Callable[[Any], Any]) -> "EventQueue":
+        """Copy the pending events (keeping the heap order), replacing their data with map_data(data)."""
+        clone = EventQueue()
+        clone._time = self._time
+        clone._queue = [replace(event, data=map_data(event.data)) for event in self._queue]
+        return clone
+
+    def size(self) -> int:
+        """Get the number of events remaining."""
+        return len(self._queue)
+
+
+def events_from_times(times: Iterable[float], event_type: EventType) -> Iterator[Event]:
+    """Wrap sorted event times (e.g. arrivals generated in bulk) into a stream of events for Simulator.add_stream()."""
+    for time in times:
+        yield Event(time=time, type=event_type)
+
 
 if __name__ == "__main__":
     queue = EventQueue()
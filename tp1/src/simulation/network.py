@@ -0,0 +1,167 @@
+from typing import Dict, List, Sequence, Tuple
+from tp1.config.network import NetworkConfig
+from tp1.src.models.hub import HubAirport, TransitMessage
+from multiprocessing.connection import Connection
+import multiprocessing
+import heapq
+import math
+
+
+class NetworkShard:
+    """A subset of the hubs of a network, each hub running its own Simulator."""
+
+    def __init__(self, config: NetworkConfig, hub_ids: Sequence[int]):
+        self.hubs: Dict[int, HubAirport] = {hub_id: HubAirport(hub_id, config.hubs[hub_id], config.seed) for hub_id in hub_ids}
+        for hub in self.hubs.values():
+            hub.schedule_arrivals()
+
+    def get_next_event_time(self) -> float:
+        """Get the time of the next pending event among the hubs of the shard."""
+        return min((hub.simulator.get_next_event_time() for hub in self.hubs.values()), default=math.inf)
+
+    def advance(self, messages: List[TransitMessage], until: float) -> Tuple[List[TransitMessage], float]:
+        """
+        Deliver the incoming planes, then run every hub until the given time.
+        Return the departures to other hubs and the time of the next pending event of the shard.
+        """
+        for message in messages:
+            self.hubs[message.destination].receive(message)
+
+        departures = []
+        for hub in self.hubs.values():
+            hub.simulator.run(until)
+            departures.extend(hub.collect_departures())
+        return departures, self.get_next_event_time()
+
+    def get_statistics(self, current_time: float) -> Dict[int, dict]:
+        """Get the performance indicators of every hub of the shard."""
+        return {hub_id: hub.get_statistics(current_time) for hub_id, hub in self.hubs.items()}
+
+
+def _run_shard_worker(connection: Connection, config: NetworkConfig, hub_ids: Sequence[int]) -> None:
+    """Serve the coordinator requests for one shard until asked to stop."""
+    shard = NetworkShard(config, hub_ids)
+    connection.send(shard.get_next_event_time())
+
+    while True:
+        command, *args = connection.recv()
+        if command == "advance":
+            connection.send(shard.advance(*args))
+        elif command == "statistics":
+            connection.send(shard.get_statistics(*args))
+        elif command == "stop":
+            break
+    connection.close()
+
+
+class NetworkSimulation:
+    """
+    Simulates a network of hubs partitioned across worker processes.
+    Shards are kept in sync with a conservative window-based protocol: as a plane needs at least the lookahead (the
+    shortest transit time) to reach another hub, no shard can receive a plane before the earliest pending event of the
+    whole network plus the lookahead, so every shard can safely run up to that time before exchanging departures.
+    """
+
+    def __init__(self, config: NetworkConfig):
+        self.config = config
+        self.lookahead = config.lookahead
+
+    def partition(self, num_shards: int) -> List[List[int]]:
+        """Split the hubs into (at most) num_shards groups of similar sizes."""
+        hub_ids = sorted(self.config.hubs)
+        return [hub_ids[shard::num_shards] for shard in range(min(num_shards, len(hub_ids)))]
+
+    def run_reference(self, simulation_time: float) -> Dict[int, dict]:
+        """Run the whole network in the current process, processing events in global time order."""
+        hubs = NetworkShard(self.config, sorted(self.config.hubs)).hubs
+
+        # Heap of (next event time, hub id), entries going stale when the next event time of their hub changes
+        agenda = [(hub.simulator.get_next_event_time(), hub_id) for hub_id, hub in hubs.items()]
+        heapq.heapify(agenda)
+
+        while agenda:
+            next_time, hub_id = heapq.heappop(agenda)
+            hub = hubs[hub_id]
+            if next_time != hub.simulator.get_next_event_time():
+                continue
+            if next_time > simulation_time:
+                break
+
+            hub.simulator.run(next_time)
+            for message in hub.collect_departures():
+                destination = hubs[message.destination]
+                destination.receive(message)
+                heapq.heappush(agenda, (destination.simulator.get_next_event_time(), message.destination))
+            heapq.heappush(agenda, (hub.simulator.get_next_event_time(), hub_id))
+
+        return {hub_id: hub.get_statistics(simulation_time) for hub_id, hub in hubs.items()}
+
+    def run(self, simulation_time: float, num_shards: int) -> Dict[int, dict]:
+        """Run the network over num_shards worker processes and gather the indicators of every hub."""
+        partition = self.partition(num_shards)
+        shard_of_hub = {hub_id: shard for shard, hub_ids in enumerate(partition) for hub_id in hub_ids}
+
+        connections = []
+        workers = []
+        for hub_ids in partition:
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_run_shard_worker, args=(worker_connection, self.config, hub_ids))
+            worker.start()
+            connections.append(connection)
+            workers.append(worker)
+
+        try:
+            next_times = [connection.recv() for connection in connections]
+            inboxes: List[List[TransitMessage]] = [[] for _ in partition]
+            current_time = 0.0
+
+            while current_time < simulation_time:
+                pending_times = [message.arrival_time for inbox in inboxes for message in inbox]
+                window_end = min(simulation_time, min(next_times + pending_times) + self.lookahead)
+
+                for connection, inbox in zip(connections, inboxes):
+                    connection.send(("advance", inbox, window_end))
+
+                inboxes = [[] for _ in partition]
+                for shard, connection in enumerate(connections):
+                    departures, next_times[shard] = connection.recv()
+                    for message in departures:
+                        inboxes[shard_of_hub[message.destination]].append(message)
+
+                current_time = window_end
+
+            statistics = {}
+            for connection in connections:
+                connection.send(("statistics", simulation_time))
+                statistics.update(connection.recv())
+            return dict(sorted(statistics.items()))
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(("stop",))
+                except (BrokenPipeError, EOFError):
+                    pass  # The worker is already gone (e.g. it failed), keep the original error
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+
+
+# python -m tp1.src.simulation.network
+if __name__ == "__main__":
+    import time
+
+    NUM_HUBS = 64
+    SIMULATION_TIME = 40000
+
+    network = NetworkSimulation(NetworkConfig.ring(NUM_HUBS))
+
+    start = time.time()
+    reference = network.run_reference(SIMULATION_TIME)
+    print(f"Reference (single process): {time.time() - start:.2f} seconds")
+
+    for num_shards in (1, 2, 4):
+        start = time.time()
+        results = network.run(SIMULATION_TIME, num_shards)
+        print(f"{num_shards} shard(s): {time.time() - start:.2f} seconds - identical to reference: {results == reference}")
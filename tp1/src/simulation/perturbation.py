@@ -0,0 +1,105 @@
+from typing import Dict, List, Tuple
+from tp1.src.models.airplane import AirPlane
+from tp1.src.simulation.statistics import confidence_interval
+import numpy as np
+
+# DOC: https://en.wikipedia.org/wiki/Infinitesimal_perturbation_analysis
+PARAMETERS = ("arrival_mean", "service_mean")
+
+
+class PerturbationAnalysis:
+    """
+    Tracks infinitesimal perturbation analysis (IPA) derivatives along the sample path of a single-server airport.
+    Inter-arrival and service times belong to scale families (X = mean * Exp(1)), so dX/dmean = X / mean, and the
+    derivatives are propagated through the Lindley recursion: a plane starting on arrival inherits the derivative of
+    its arrival time, a plane that waited inherits the derivative of the end of the previous service.
+    Every derivative is a pair (d/d arrival_mean, d/d service_mean).
+    The analysis can start mid-run (e.g. after a warm-up): the planes already arrived are then ignored, and the
+    state at that time (queue, remaining service) is held fixed when differentiating.
+    """
+
+    def __init__(self, arrival_mean: float, service_mean: float, first_plane_id: int = 0, start_time: float = 0.0):
+        """
+        - arrival_mean (float): Mean inter-arrival time
+        - service_mean (float): Mean service time
+        - first_plane_id (int): Id of the first plane to arrive once the analysis is enabled
+        - start_time (float): Arrival time of the last plane before the analysis is enabled (0.0 if none)
+        """
+        self.arrival_mean = arrival_mean
+        self.service_mean = service_mean
+        self.first_plane_id = first_plane_id
+
+        self._last_arrival_time = start_time
+        self._d_last_arrival_time = (0.0, 0.0)
+        self._d_last_end_time = (0.0, 0.0)
+
+        self._inter_arrival_times: List[float] = []  # By plane id, from first_plane_id
+        self._d_arrival_times: List[Tuple[float, float]] = []  # By plane id, from first_plane_id
+
+        # One row per plane, in service order: inter-arrival time, service time, end time, waiting time, then the
+        # derivatives of the waiting time with respect to the arrival and service means
+        self._services: List[Tuple[float, float, float, float, float, float]] = []
+
+    def record_arrival(self, plane: AirPlane) -> None:
+        """Propagate the derivatives to the arrival time of a new plane."""
+        inter_arrival_time = plane.queue_entry_time - self._last_arrival_time
+        self._last_arrival_time = plane.queue_entry_time
+        self._d_last_arrival_time = (self._d_last_arrival_time[0] + inter_arrival_time / self.arrival_mean, 0.0)
+
+        self._inter_arrival_times.append(inter_arrival_time)
+        self._d_arrival_times.append(self._d_last_arrival_time)
+
+    def record_service_start(self, plane: AirPlane, service_time: float) -> None:
+        """Propagate the derivatives to the start and end of service of a plane."""
+        if plane.id < self.first_plane_id:
+            return  # Arrived before the analysis started
+        index = plane.id - self.first_plane_id
+
+        d_arrival_time = self._d_arrival_times[index]
+        waited = plane.service_start_time > plane.queue_entry_time
+        d_start_time = self._d_last_end_time if waited else d_arrival_time
+        self._d_last_end_time = (d_start_time[0], d_start_time[1] + service_time / self.service_mean)
+
+        self._services.append(
+            (
+                self._inter_arrival_times[index],
+                service_time,
+                plane.service_start_time + service_time,
+                plane.waiting_time,
+                d_start_time[0] - d_arrival_time[0],
+                d_start_time[1] - d_arrival_time[1],
+            )
+        )
+
+    def get_sensitivities(
+        self, current_time: float, num_batches: int = 20, level: float = 0.95
+    ) -> Dict[str, Dict[str, Tuple[float, float]]]:
+        """
+        Estimate the mean waiting time, the robot utilization and their derivatives over the planes unloaded by the
+        given time, with confidence intervals (mean, half width) computed by batch means over consecutive planes.
+        The utilization is estimated per plane, as the total service time over the total inter-arrival time.
+        """
+        services = np.array(self._services).reshape(-1, 6)
+        services = services[services[:, 2] <= current_time]
+        if len(services) < num_batches:
+            raise ValueError(f"Not enough unloaded planes ({len(services)}) for {num_batches} batches")
+
+        metrics = ("mean_waiting_time", "robot_utilization")
+        estimates = {name: {"value": [], **{parameter: [] for parameter in PARAMETERS}} for name in metrics}
+        for batch in np.array_split(services, num_batches):
+            inter_arrival_times, service_times, _, waiting_times, d_waiting_arrival, d_waiting_service = batch.T
+
+            # Total inter-arrival (resp. service) time scales with the arrival (resp. service) mean only
+            utilization = service_times.sum() / inter_arrival_times.sum()
+
+            estimates["mean_waiting_time"]["value"].append(waiting_times.mean())
+            estimates["mean_waiting_time"]["arrival_mean"].append(d_waiting_arrival.mean())
+            estimates["mean_waiting_time"]["service_mean"].append(d_waiting_service.mean())
+            estimates["robot_utilization"]["value"].append(utilization)
+            estimates["robot_utilization"]["arrival_mean"].append(-utilization / self.arrival_mean)
+            estimates["robot_utilization"]["service_mean"].append(utilization / self.service_mean)
+
+        return {
+            name: {key: confidence_interval(values, level) for key, values in metric.items()}
+            for name, metric in estimates.items()
+        }
@@ -0,0 +1,134 @@
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional
+from tp1.src.simulation.events import EventType
+import json
+import time
+
+
+@dataclass
+class EventTypeStats:
+    """Dispatch statistics collected for a single event type."""
+
+    count: int = 0
+    total_time: float = 0.0  # Cumulative handler wall time (seconds)
+    max_time: float = 0.0  # Slowest single handler call (seconds)
+
+    @property
+    def mean_time(self) -> float:
+        """Calculate the mean handler wall time."""
+        return self.total_time / self.count if self.count > 0 else 0.0
+
+
+class SimulationProfiler:
+    """Collects per-event-type dispatch counters and timings for a Simulator run."""
+
+    def __init__(
+        self, report_interval: Optional[float] = None, on_report: Optional[Callable[["SimulationProfiler"], None]] = None
+    ):
+        """
+        - report_interval (float): Wall time in seconds between two periodic reports (None disables them)
+        - on_report (Callable): Function called with the profiler at each periodic report and at the end of the run
+        """
+        self.report_interval = report_interval
+        self.on_report = on_report
+
+        self.stats: Dict[EventType, EventTypeStats] = {}
+        self.peak_heap_size = 0
+        self.total_events = 0
+
+        self._elapsed = 0.0  # Wall time of the previous (stopped) runs
+
+        self._start_time = None
+        self._next_report_time = None
+
+    def start(self) -> None:
+        """Start (or resume) timing a run."""
+        self._start_time = time.perf_counter()
+        if self.report_interval is not None:
+            self._next_report_time = self._start_time + self.report_interval
+
+    def record(self, event_type: EventType, elapsed: float, heap_size: int) -> None:
+        """Record one handler dispatch."""
+        stats = self.stats.get(event_type)
+        if stats is None:
+            stats = self.stats[event_type] = EventTypeStats()
+
+        stats.count += 1
+        stats.total_time += elapsed
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+
+        if heap_size > self.peak_heap_size:
+            self.peak_heap_size = heap_size
+        self.total_events += 1
+
+        if self._next_report_time is not None:
+            now = time.perf_counter()
+            if now >= self._next_report_time:
+                self._next_report_time = now + self.report_interval
+                self._report()
+
+    def stop(self) -> None:
+        """Stop timing the run and emit a final report."""
+        self._elapsed = self.wall_time
+        self._start_time = None
+        self._next_report_time = None
+        self._report()
+
+    def _report(self) -> None:
+        """Notify the report callback, if any."""
+        if self.on_report is not None:
+            self.on_report(self)
+
+    @property
+    def wall_time(self) -> float:
+        """Get the wall time spent in profiled runs, including the current one."""
+        if self._start_time is None:
+            return self._elapsed
+        return self._elapsed + time.perf_counter() - self._start_time
+
+    @property
+    def events_per_second(self) -> float:
+        """Calculate the overall dispatch throughput."""
+        return self.total_events / self.wall_time if self.wall_time > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Export the collected metrics as a plain dictionary."""
+        return {
+            "total_events": self.total_events,
+            "wall_time": self.wall_time,
+            "events_per_second": self.events_per_second,
+            "peak_heap_size": self.peak_heap_size,
+            "event_types": {
+                event_type.name: {**asdict(stats), "mean_time": stats.mean_time} for event_type, stats in self.stats.items()
+            },
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Export the collected metrics as JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "simulation") -> str:
+        """Export the collected metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# TYPE {prefix}_events_total counter",
+            f"{prefix}_events_total {self.total_events}",
+            f"# TYPE {prefix}_wall_time_seconds gauge",
+            f"{prefix}_wall_time_seconds {self.wall_time}",
+            f"# TYPE {prefix}_events_per_second gauge",
+            f"{prefix}_events_per_second {self.events_per_second}",
+            f"# TYPE {prefix}_peak_heap_size gauge",
+            f"{prefix}_peak_heap_size {self.peak_heap_size}",
+        ]
+
+        per_type_metrics = [
+            ("handler_calls_total", "counter", lambda stats: stats.count),
+            ("handler_seconds_total", "counter", lambda stats: stats.total_time),
+            ("handler_seconds_max", "gauge", lambda stats: stats.max_time),
+        ]
+        for name, metric_type, value in per_type_metrics:
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for event_type, stats in self.stats.items():
+                lines.append(f'{prefix}_{name}{{event_type="{event_type.name}"}} {value(stats)}')
+
+        return "\n".join(lines) + "\n"
@@ -1,5 +1,8 @@
 from tp1.src.simulation.events import Event, EventQueue, EventType
-from typing import Callable
+from tp1.src.simulation.profiling import SimulationProfiler
+from typing import Any, Callable, Iterable, List, Optional
+import math
+import time
 
 
 class Simulator:
@@ -10,29 +13,163 @@ class Simulator:
         self.event_queue = EventQueue()
         self.current_time = 0.0
         self.event_handlers = {}  # {EventType: Callable[[Event], None]}
+        self.profiler: Optional[SimulationProfiler] = None
+        self.streams: List[list] = []  # [[next Event, Iterator[Event]], ...] for exogenous events kept out of the heap
 
     def register_handler(self, event_type: EventType, handler: Callable[[Event], None]) -> None:
         """Register an event handler for a specific event type."""
         self.event_handlers[event_type] = handler
 
+    def enable_profiling(self, profiler: Optional[SimulationProfiler] = None) -> SimulationProfiler:
+        """Record per-event-type counters and timings during the next runs."""
+        self.profiler = profiler or SimulationProfiler()
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        """Go back to the non-instrumented run loop."""
+        self.profiler = None
+
     def schedule(self, event: Event) -> None:
         """Schedule a new event."""
         self.event_queue.schedule(event)
 
+    def add_stream(self, events: Iterable[Event]) -> None:
+        """
+        Merge a time-sorted stream of exogenous events (that never depend on the system state, e.g. arrivals) into
+        the run loop instead of pushing them one by one on the event queue.
+        The stream is consumed lazily: its next event is only pulled once the previous one is dispatched.
+        """
+        iterator = iter(events)
+        head = next(iterator, None)
+        if head is not None:
+            self.streams.append([head, iterator])
+
+    def fork(
+        self,
+        map_data: Callable[[Any], Any] = lambda data: data,
+        fork_stream: Optional[Callable[[Event], Iterable[Event]]] = None,
+    ) -> "Simulator":
+        """
+        Copy the clock and pending events into a new simulator, without handlers nor profiler.
+        - map_data (Callable): Maps the data of the pending events to the data of their copies (e.g. forked planes)
+        - fork_stream (Callable): Builds the rest of an exogenous stream from its next event (generators cannot be copied)
+        """
+        clone = Simulator()
+        clone.current_time = self.current_time
+        clone.event_queue = self.event_queue.fork(map_data)
+
+        for head, _ in self.streams:
+            if fork_stream is None:
+                raise ValueError("Forking a simulator with exogenous streams requires fork_stream")
+            clone.add_stream(fork_stream(head))
+        return clone
+
     def get_current_time(self) -> float:
         """Get the current simulation time."""
         return self.current_time
 
+    def get_next_event_time(self) -> float:
+        """Get the time of the next pending event (math.inf if there is none)."""
+        times = [stream[0].time for stream in self.streams]
+        if self.event_queue.has_events():
+            times.append(self.event_queue.peek().time)
+        return min(times, default=math.inf)
+
     def run(self, max_time: float) -> None:
-        """Run the simulation until max_time is reached."""
+        """
+        Run the simulation until max_time is reached.
+        Events after max_time are left pending, so that a later call resumes the simulation from there.
+        """
+        # The instrumented loop is only swapped in when profiling is enabled to keep the default loop overhead-free
+        if self.profiler is not None:
+            self._run_profiled(max_time)
+            return
+        if self.streams:
+            self._run_merged(max_time)
+            return
+
         while self.event_queue.has_events():
             # DEBUG TIP: Breakpoint here to see the events in the queue
             event = self.event_queue.next_event()
 
-            # This avoid to process events that are after the max_time
+            # This avoid to process events that are after the max_time (put back for the next run)
             if event.time > max_time:
+                self.event_queue.schedule(event)
                 break
 
             self.current_time = event.time
             if event.type in self.event_handlers:
                 self.event_handlers[event.type](event)
+
+    def run_until(self, max_time: float, condition: Callable[[], bool]) -> bool:
+        """
+        Run the simulation until max_time is reached or condition() holds after an event.
+        Return whether the condition was met.
+        """
+        while True:
+            event = self._next_event(max_time)
+            if event is None:
+                return False
+
+            self.current_time = event.time
+            if event.type in self.event_handlers:
+                self.event_handlers[event.type](event)
+            if condition():
+                return True
+
+    def _next_event(self, max_time: float) -> Optional[Event]:
+        """
+        Remove and return the earliest event among the event queue and the exogenous streams.
+        Return None if there is no event left until max_time.
+        """
+        stream = None
+        for candidate in self.streams:
+            if stream is None or candidate[0].time < stream[0].time:
+                stream = candidate
+
+        # On ties, exogenous events go first as they were known (scheduled) before any endogenous one
+        if stream is not None and (not self.event_queue.has_events() or stream[0].time <= self.event_queue.peek().time):
+            event = stream[0]
+            if event.time > max_time:
+                return None
+
+            head = next(stream[1], None)
+            if head is None:
+                self.streams.remove(stream)
+            else:
+                stream[0] = head
+            return event
+
+        if self.event_queue.has_events() and self.event_queue.peek().time <= max_time:
+            return self.event_queue.next_event()
+        return None
+
+    def _run_merged(self, max_time: float) -> None:
+        """Same as run() but merging the exogenous streams with the event queue."""
+        while True:
+            event = self._next_event(max_time)
+            if event is None:
+                break
+
+            self.current_time = event.time
+            if event.type in self.event_handlers:
+                self.event_handlers[event.type](event)
+
+    def _run_profiled(self, max_time: float) -> None:
+        """Same as run() but recording every dispatch in the profiler."""
+        profiler = self.profiler
+        profiler.start()
+        try:
+            while True:
+                heap_size = self.event_queue.size()
+                event = self._next_event(max_time)
+                if event is None:
+                    break
+
+                self.current_time = event.time
+                if event.type in self.event_handlers:
+                    start = time.perf_counter()
+                    self.event_handlers[event.type](event)
+                    profiler.record(event.type, time.perf_counter() - start, heap_size)
+        finally:
+            profiler.stop()
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import List, Sequence
+from tp1.config.simulation import SimulationConfig
+from tp1.src.models.airport import Airport
+from tp1.src.random.distributions import ExponentialDistribution
+from tp1.src.simulation.statistics import confidence_interval
+import numpy as np
+import random
+import math
+
+
+@dataclass
+class SplittingResult:
+    """Estimate of a rare-event probability by multilevel splitting."""
+
+    probability: float
+    half_width: float  # Of the confidence interval over independent runs (nan for a single run)
+    relative_error: float  # Estimated standard deviation of the estimator over the probability
+    level_probabilities: List[float]  # Mean conditional probability of reaching each level from the previous one
+    num_runs: int
+
+
+# DOC: https://en.wikipedia.org/wiki/Rare_event_sampling
+class FixedEffortSplitting:
+    """
+    Estimates the probability that the airport queue reaches a (large) length during a busy cycle, i.e. after the
+    first arrival and before the airport becomes empty again, with fixed-effort multilevel splitting.
+    At each intermediate level, the same number of paths is started from states forked (with fresh random numbers)
+    among the states in which the previous paths reached the level. The probability is the product of the fractions
+    of paths reaching each level, which is an unbiased estimator.
+    """
+
+    def __init__(
+        self,
+        num_robots: int,
+        levels: Sequence[int],
+        paths_per_level: int = 1000,
+        seed: int = SimulationConfig.RANDOM_SEED,
+        max_time: float = math.inf,
+    ):
+        """
+        - num_robots (int): Scenario to simulate (see SimulationConfig.ROBOT_SCENARIOS)
+        - levels (Sequence[int]): Increasing queue lengths, the last one being the threshold of interest
+        - paths_per_level (int): Number of paths simulated from each level (the effort)
+        - max_time (float): Paths still busy at this time fail as well
+        """
+        if not levels or list(levels) != sorted(set(levels)) or levels[0] < 1:
+            raise ValueError("Levels must be strictly increasing positive queue lengths")
+
+        self.config = SimulationConfig(num_robots)
+        self.levels = list(levels)
+        self.paths_per_level = paths_per_level
+        self.max_time = max_time
+        self.rng = random.Random(seed)  # Only draws the seeds of the paths
+
+    def _new_seed(self) -> int:
+        """Draw the seed of a new path."""
+        return self.rng.getrandbits(64)
+
+    def _new_airport(self) -> Airport:
+        """Create an empty airport drawing from its own random number generator."""
+        rng = random.Random(self._new_seed())
+        airport = Airport(
+            num_robots=self.config.num_robots,
+            inter_arrival_time=ExponentialDistribution(mean=self.config.MEAN_ARRIVAL_TIME, rng=rng),
+            processing_time=ExponentialDistribution(mean=self.config.robot_processing_time, rng=rng),
+        )
+        airport.schedule_arrivals()
+        return airport
+
+    def _run_path(self, airport: Airport, level: int) -> bool:
+        """Run a path until the queue reaches the level (success) or the airport empties (failure)."""
+        airport.simulator.run_until(self.max_time, lambda: airport.get_queue_length() >= level or airport.is_empty())
+        return airport.get_queue_length() >= level
+
+    def run(self) -> SplittingResult:
+        """Run the splitting procedure once."""
+        level_probabilities = []
+        entrance_states: List[Airport] = []
+
+        for stage, level in enumerate(self.levels):
+            successes = []
+            for _ in range(self.paths_per_level):
+                airport = self._new_airport() if stage == 0 else self.rng.choice(entrance_states).fork(seed=self._new_seed())
+                if self._run_path(airport, level):
+                    successes.append(airport)
+
+            level_probabilities.append(len(successes) / self.paths_per_level)
+            entrance_states = successes
+            if not successes:
+                break
+
+        level_probabilities += [0.0] * (len(self.levels) - len(level_probabilities))
+        probability = math.prod(level_probabilities)
+
+        # Usual approximation, neglecting the dependence between stages introduced by the shared entrance states
+        if probability > 0:
+            relative_error = math.sqrt(sum((1 - p) / (self.paths_per_level * p) for p in level_probabilities))
+        else:
+            relative_error = math.inf
+        return SplittingResult(probability, math.nan, relative_error, level_probabilities, num_runs=1)
+
+    def estimate(self, num_runs: int, level: float = 0.95) -> SplittingResult:
+        """Average independent runs of the splitting procedure, with an empirical confidence interval and relative error."""
+        runs = [self.run() for _ in range(num_runs)]
+        probabilities = [run.probability for run in runs]
+        probability, half_width = confidence_interval(probabilities, level)
+
+        if probability > 0 and num_runs > 1:
+            relative_error = float(np.std(probabilities, ddof=1) / math.sqrt(num_runs) / probability)
+        else:
+            relative_error = math.inf
+        level_probabilities = np.mean([run.level_probabilities for run in runs], axis=0).tolist()
+        return SplittingResult(probability, half_width, relative_error, level_probabilities, num_runs)
+
+
+# python -m tp1.src.simulation.splitting
+if __name__ == "__main__":
+    THRESHOLD = 20
+
+    for num_robots in (8, 12):
+        splitting = FixedEffortSplitting(num_robots, levels=range(2, THRESHOLD + 1, 2), paths_per_level=500)
+        result = splitting.estimate(num_runs=10)
+
+        # M/M/1 gambler's ruin: from 1 plane in the system, reach THRESHOLD + 1 planes before 0
+        ratio = SimulationConfig.MEAN_ARRIVAL_TIME / SimulationConfig.ROBOT_SCENARIOS[num_robots]
+        exact = (ratio - 1) / (ratio ** (THRESHOLD + 1) - 1)
+
+        print(f"{num_robots} robots - P(queue >= {THRESHOLD} in a busy cycle):")
+        print(f"  splitting: {result.probability:.3e} ± {result.half_width:.3e} (relative error {result.relative_error:.1%})")
+        print(f"  exact:     {exact:.3e}")
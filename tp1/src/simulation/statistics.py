@@ -0,0 +1,13 @@
+from typing import Sequence, Tuple
+from scipy import stats
+import numpy as np
+
+
+def confidence_interval(values: Sequence[float], level: float = 0.95) -> Tuple[float, float]:
+    """Compute a Student confidence interval (mean, half width) from independent observations."""
+    values = np.asarray(values, dtype=float)
+    mean = float(np.mean(values))
+    if len(values) < 2:
+        return mean, float("nan")
+    quantile = stats.t.ppf((1 + level) / 2, df=len(values) - 1)
+    return mean, float(quantile * np.std(values, ddof=1) / np.sqrt(len(values)))
@@ -1,14 +1,23 @@
 from simpy import Environment, Resource
 
-from random import expovariate, seed
-from typing import Generator
+from random import seed
+from typing import Generator, Optional
+
+import math
 
 from config.simulation_config import SimulationConfig
+from models.sources import DurationSource, ExponentialSource
 
 
 class Airport:
 
-    def __init__(self, config: SimulationConfig, robots_count: int) -> None:
+    def __init__(
+        self,
+        config: SimulationConfig,
+        robots_count: int,
+        inter_arrival_time: Optional[DurationSource] = None,
+        unloading_time: Optional[DurationSource] = None,
+    ) -> None:
         self.config: SimulationConfig = config
         seed(self.config.RANDOM_SEED)
         self.env: Environment = Environment()
@@ -20,6 +29,10 @@ class Airport:
         self.planes_queue_lenght: int = 0
 
         self.robots_count: int = robots_count
+        self.inter_arrival_time: DurationSource = inter_arrival_time or ExponentialSource(self.config.PLANES_MEAN_ARRIVAL_TIME)
+        self.unloading_time: DurationSource = unloading_time or ExponentialSource(
+            self.config.ROBOTs_MEAN_UNLOADING_TIMES[robots_count]
+        )
         self.robots_busy_time: float = 0.0
 
         self.total_time_of_operations: float = 0.0
@@ -32,12 +45,15 @@ class Airport:
 
     def _handle_plane_arrival(self) -> Generator:
         while True:
-            yield from self._wait_for_new_plane()
+            inter_arrival_time: float = self.inter_arrival_time.generate()
+            if math.isinf(inter_arrival_time):
+                return
+            yield from self._wait_for_new_plane(inter_arrival_time)
             self._create_new_plane()
             self.env.process(self._unload_plane())
 
-    def _wait_for_new_plane(self) -> Generator:
-        yield self.env.timeout(expovariate(1 / self.config.PLANES_MEAN_ARRIVAL_TIME))
+    def _wait_for_new_plane(self, inter_arrival_time: float) -> Generator:
+        yield self.env.timeout(inter_arrival_time)
 
     def _create_new_plane(self) -> None:
         self.total_planes += 1
@@ -58,7 +74,10 @@ class Airport:
     def _robots_unload_plane(self) -> Generator:
         robots_busy_start_time = self.env.now
 
-        yield self.env.timeout(expovariate(1 / self.config.ROBOTs_MEAN_UNLOADING_TIMES[self.robots_count]))
+        unloading_time: float = self.unloading_time.generate()
+        if math.isinf(unloading_time):
+            raise ValueError(f"Unloading time source exhausted at time {self.env.now:.1f} (end of the replayed trace)")
+        yield self.env.timeout(unloading_time)
         self.planes_unloaded_count += 1
 
         robots_busy_end_time = self.env.now
@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+from random import expovariate
+from typing import Iterator, List, Optional
+
+import math
+import numpy as np
+import pandas as pd
+
+
+class DurationSource(ABC):
+
+    @abstractmethod
+    def generate(self) -> float:
+        pass
+
+
+class ExponentialSource(DurationSource):
+
+    def __init__(self, mean: float) -> None:
+        self.mean: float = mean
+
+    def generate(self) -> float:
+        return expovariate(1 / self.mean)
+
+
+class TraceSource(DurationSource):
+    """Replays durations (or delays between sorted timestamps) from a schedule file, one chunk at a time."""
+
+    def __init__(self, timestamps: bool = False, origin: float = 0.0) -> None:
+        self.timestamps: bool = timestamps
+        self._last_timestamp: float = origin
+
+        self._chunks: Iterator[np.ndarray] = self._read_chunks()
+        self._chunk: List[float] = []
+        self._position: int = 0
+        self._exhausted: bool = False
+
+    @abstractmethod
+    def _read_chunks(self) -> Iterator[np.ndarray]:
+        pass
+
+    def _next_value(self) -> Optional[float]:
+        while self._position >= len(self._chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return None
+            self._chunk = chunk.tolist()
+            self._position = 0
+
+        value: float = self._chunk[self._position]
+        self._position += 1
+        return value
+
+    def generate(self) -> float:
+        if self._exhausted:
+            return math.inf
+
+        value: Optional[float] = self._next_value()
+        if value is None:
+            self._exhausted = True
+            return math.inf
+
+        if not self.timestamps:
+            return value
+
+        duration: float = value - self._last_timestamp
+        if duration < 0:
+            raise ValueError(f"Trace timestamps must be sorted ({value} follows {self._last_timestamp})")
+        self._last_timestamp = value
+        return duration
+
+
+class MemmapTraceSource(TraceSource):
+
+    def __init__(
+        self,
+        path: str,
+        dtype: str = "<f8",
+        num_columns: int = 1,
+        column: int = 0,
+        chunk_size: int = 65536,
+        timestamps: bool = False,
+        origin: float = 0.0,
+    ) -> None:
+        self.trace: np.memmap = np.memmap(path, dtype=dtype, mode="r").reshape(-1, num_columns)
+        self.column: int = column
+        self.chunk_size: int = chunk_size
+        super().__init__(timestamps=timestamps, origin=origin)
+
+    def _read_chunks(self) -> Iterator[np.ndarray]:
+        for start in range(0, len(self.trace), self.chunk_size):
+            yield np.asarray(self.trace[start : start + self.chunk_size, self.column], dtype=float)
+
+
+class CsvTraceSource(TraceSource):
+
+    def __init__(self, path: str, column: str, chunk_size: int = 65536, timestamps: bool = False, origin: float = 0.0) -> None:
+        self.path: str = path
+        self.column: str = column
+        self.chunk_size: int = chunk_size
+        super().__init__(timestamps=timestamps, origin=origin)
+
+    def _read_chunks(self) -> Iterator[np.ndarray]:
+        with pd.read_csv(self.path, usecols=[self.column], chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                yield chunk[self.column].to_numpy(dtype=float)